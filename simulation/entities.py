@@ -19,6 +19,8 @@ ProposalStatus = Enum("ProposalStatus", "CANDIDATE ACTIVE COMPLETED FAILED")
 
 
 class Proposal:
+    __slots__ = ("conviction", "status", "age", "funds_requested", "trigger")
+
     def __init__(self, funds_requested: int, trigger: float):
         self.conviction = 0
         self.status = ProposalStatus.CANDIDATE
@@ -59,6 +61,8 @@ class Proposal:
 
 
 class Participant:
+    __slots__ = ("_probability_func", "_random_number_func", "sentiment", "holdings")
+
     def __init__(self, holdings: TokenBatch, probability_func, random_number_func):
         self._probability_func = probability_func
         self._random_number_func = random_number_func
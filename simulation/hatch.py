@@ -36,6 +36,8 @@ VestingOptions = namedtuple("VestingOptions", "cliff_days halflife_days")
 
 
 class TokenBatch:
+    __slots__ = ("vesting", "nonvesting", "vesting_spent", "age_days", "cliff_days", "halflife_days")
+
     def __init__(self, vesting: float, nonvesting: float, vesting_options=None):
         self.vesting = vesting
         self.nonvesting = nonvesting
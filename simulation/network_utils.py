@@ -2,51 +2,31 @@ from typing import Dict, List, Tuple
 
 import networkx as nx
 import numpy as np
-from networkx.classes.reportviews import NodeDataView
 
 from convictionvoting import trigger_threshold
 from entities import Participant, ParticipantSupport, Proposal, ProposalStatus
 from hatch import TokenBatch
 
 
-def get_edges_by_type(network: nx.DiGraph, edge_type_selection: str):
-    def filter_by_type(n1, n2):
-        if network.edges[(n1, n2)]["type"] == edge_type_selection:
-            return True
-        return False
-
-    view = nx.subgraph_view(network, filter_edge=filter_by_type)
-    return view.edges()
+def get_edges_by_type(network: nx.DiGraph, edge_type_selection: str) -> List[Tuple[int, int]]:
+    """
+    Returns the (u, v) pairs of all edges of the given type.
+    """
+    return [(u, v) for u, v, t in network.edges(data="type") if t == edge_type_selection]
 
 
 def get_edges_by_participant_and_type(network: nx.DiGraph, participant_idx: int, edge_type_selection: str) -> Dict:
     edges_view = network.adj[participant_idx]
-    answer = {}
-    for key in edges_view:
-        if edges_view[key]["type"] == "support":
-            answer[key] = edges_view[key]
-    return answer
-
+    return {key: data for key, data in edges_view.items() if data.get("type") == edge_type_selection}
 
-def get_proposals(network: nx.DiGraph, status: ProposalStatus = None):
-    def filter_proposal(n):
-        if isinstance(network.nodes[n]["item"], Proposal):
-            if status:
-                return network.nodes[n]["item"].status == status
-            return True
-        return False
 
-    view = nx.subgraph_view(network, filter_node=filter_proposal)
-    return view.nodes(data="item")
+def get_proposals(network: nx.DiGraph, status: ProposalStatus = None) -> List[Tuple[int, Proposal]]:
+    return [(i, item) for i, item in network.nodes(data="item")
+            if isinstance(item, Proposal) and (not status or item.status == status)]
 
 
-def get_participants(network: nx.DiGraph) -> NodeDataView:
-    def filter_participant(n):
-        if isinstance(network.nodes[n]["item"], Participant):
-            return True
-        return False
-    view = nx.subgraph_view(network, filter_node=filter_participant)
-    return view.nodes(data="item")
+def get_participants(network: nx.DiGraph) -> List[Tuple[int, Participant]]:
+    return [(i, item) for i, item in network.nodes(data="item") if isinstance(item, Participant)]
 
 
 def add_proposal(network: nx.DiGraph, p: Proposal, random_number_func) -> Tuple[nx.DiGraph, int]:
@@ -111,39 +91,42 @@ def setup_influence_edges_bulk(network: nx.DiGraph, exponential_func) -> nx.DiGr
     Participant in network.nodes. If this argument is present, it will setup the
     influence edges only for this Participant.
     """
-    # Turn it into a dict to make a copy out of the View, because the View
-    # changes whenever we add edges to the graph, which results in RuntimeError:
-    # dictionary changed size during iteration
-    participants = dict(get_participants(network))
-
-    for i in participants:
-        for other_participant in participants:
-            if not(other_participant == i) and not network.has_edge(i, other_participant):
-                influence_rv = influence(exponential_func)
-                if influence_rv:
-                    network.add_edge(i, other_participant,
-                                     influence=influence_rv, type="influence")
+    participants = [i for i, _ in get_participants(network)]
+    succ = network.succ
+
+    # Every ordered pair is visited once, so which pairs are still free can be
+    # decided up front and all new edges added in one go.
+    candidates = [(i, other_participant) for i in participants for other_participant in participants
+                  if not(other_participant == i) and other_participant not in succ[i]]
+    new_edges = []
+    for i, other_participant in candidates:
+        influence_rv = influence(exponential_func)
+        if influence_rv:
+            new_edges.append((i, other_participant, {"influence": influence_rv, "type": "influence"}))
+    network.add_edges_from(new_edges)
     return network
 
 
 def setup_influence_edges_single(network: nx.DiGraph, participant: int, exponential_func):
-    p = dict(get_participants(network))
-    del p[participant]
-    other_participants = p
+    other_participants = [i for i, _ in get_participants(network) if i != participant]
+    # The new edges all touch this Participant, so its own adjacency dicts are
+    # enough to tell which of them already exist.
+    pred = network.pred[participant]
+    succ = network.succ[participant]
 
     # If we already have Participants at index 0,1,2,3,4 and we added a
     # Participant at index 5, this creates the edges 0,5; 1,5; 2;5 etc.
+    new_edges = []
     for other in other_participants:
-        if not network.has_edge(other, participant):
+        if other not in pred:
             influence_rv = influence(exponential_func)
             if influence_rv:
-                network.add_edge(other, participant,
-                                 influence=influence_rv, type="influence")
-        if not network.has_edge(participant, other):
+                new_edges.append((other, participant, {"influence": influence_rv, "type": "influence"}))
+        if other not in succ:
             influence_rv = influence(exponential_func)
             if influence_rv:
-                network.add_edge(participant, other,
-                                 influence=influence_rv, type="influence")
+                new_edges.append((participant, other, {"influence": influence_rv, "type": "influence"}))
+    network.add_edges_from(new_edges)
     return network
 
 
@@ -157,31 +140,23 @@ def setup_conflict_edges(network: nx.DiGraph, random_number_func, proposal=None,
     Proposal in network.nodes. If this argument is present, it will setup the
     conflict edges only for this Proposal.
     """
-    def loop_over_other_proposals(network, proposals, proposal, random_number_func):
-        for other_proposal in proposals:
-            if not(other_proposal == proposal):
-                # (rate=0.25) means 25% of other Proposals are going to conflict
-                # with this particular Proposal. And when they do conflict, the
-                # conflict number is high (at least 1 - 0.25 = 0.75).
-                conflict_rv = random_number_func()
-                if conflict_rv < rate:
-                    network.add_edge(proposal, other_proposal)
-                    network.edges[(proposal, other_proposal)
-                                  ]['conflict'] = 1-conflict_rv
-                    network.edges[(proposal, other_proposal)
-                                  ]['type'] = 'conflict'
-        return network
-    # Turn it into a dict to make a copy out of the View, because the View
-    # changes whenever we add edges to the graph, which results in RuntimeError:
-    # dictionary changed size during iteration
-    proposals = dict(get_proposals(network))
+    proposals = [i for i, _ in get_proposals(network)]
 
     # Do not use "if not proposal" - index number 0 will evaluate to False.
-    if proposal is None:
-        for i in proposals:
-            network = loop_over_other_proposals(network, proposals, i, random_number_func)
-        return network
-    return loop_over_other_proposals(network, proposals, proposal, random_number_func)
+    sources = proposals if proposal is None else [proposal]
+    pairs = [(i, other_proposal) for i in sources for other_proposal in proposals
+             if not(other_proposal == i)]
+
+    new_edges = []
+    for i, other_proposal in pairs:
+        # (rate=0.25) means 25% of other Proposals are going to conflict
+        # with this particular Proposal. And when they do conflict, the
+        # conflict number is high (at least 1 - 0.25 = 0.75).
+        conflict_rv = random_number_func()
+        if conflict_rv < rate:
+            new_edges.append((i, other_proposal, {"conflict": 1-conflict_rv, "type": "conflict"}))
+    network.add_edges_from(new_edges)
+    return network
 
 
 def setup_support_edges(network: nx.DiGraph, random_number_func, idx=None) -> nx.DiGraph:
@@ -194,7 +169,7 @@ def setup_support_edges(network: nx.DiGraph, random_number_func, idx=None) -> nx
     support edges to other Proposal nodes and vice versa if the node is a
     Proposal.
     """
-    def create_support_edge(n, i, j, random_number_func):
+    def support_edge(i, j):
         # Token Holder -> Proposal Relationship
         # Looks like Zargham skewed this distribution heavily towards
         # numbers smaller than 0.25 This is the affinity towards proposals.
@@ -202,23 +177,19 @@ def setup_support_edges(network: nx.DiGraph, random_number_func, idx=None) -> nx
         # will be a few Proposals that they really care about.
         rv = random_number_func()
         a_rv = 1-4*(1-rv)*rv
-        n.add_edge(i, j, support=ParticipantSupport(affinity=a_rv, tokens=0, conviction=0), type="support")
-        return n
-    participants = dict(get_participants(network))
-    proposals = dict(get_proposals(network))
+        return i, j, {"support": ParticipantSupport(affinity=a_rv, tokens=0, conviction=0), "type": "support"}
 
     if idx is None:
-        for prop in proposals:
-            for par in participants:
-                network = create_support_edge(network, par, prop, random_number_func)
-
+        participants = [i for i, _ in get_participants(network)]
+        pairs = [(par, prop) for prop, _ in get_proposals(network) for par in participants]
+    elif isinstance(network.nodes[idx]['item'], Proposal):
+        pairs = [(par, idx) for par, _ in get_participants(network)]
+    elif isinstance(network.nodes[idx]['item'], Participant):
+        pairs = [(idx, prop) for prop, _ in get_proposals(network)]
     else:
-        if isinstance(network.nodes[idx]['item'], Proposal):
-            for par in participants:
-                network = create_support_edge(network, par, idx, random_number_func)
-        elif isinstance(network.nodes[idx]['item'], Participant):
-            for prop in proposals:
-                network = create_support_edge(network, idx, prop, random_number_func)
+        pairs = []
+
+    network.add_edges_from([support_edge(i, j) for i, j in pairs])
     return network
 
 
@@ -243,67 +214,56 @@ def bootstrap_network(n_participants: List[TokenBatch], n_proposals: int, fundin
 
 def calc_total_funds_requested(network: nx.DiGraph):
     candidates = get_proposals(network, status=ProposalStatus.CANDIDATE)
-    fund_requests = [j[1].funds_requested for j in candidates]
-    total_funds_requested = np.sum(fund_requests)
+    total_funds_requested = sum(proposal.funds_requested for _, proposal in candidates)
     return total_funds_requested
 
 
 def calc_median_affinity(network: nx.DiGraph):
-    supporters = get_edges_by_type(network, 'support')
-    if len(supporters) == 0:
+    affinities = [data["support"].affinity for _, _, data in network.edges(data=True) if data.get("type") == "support"]
+    if len(affinities) == 0:
         raise Exception("The network has 0 support edges!")
 
-    affinities = [network.edges[e]['support'].affinity for e in supporters]
     median_affinity = np.median(affinities)
     return median_affinity
 
 
 def calc_total_conviction(network: nx.DiGraph, proposal_idx: int) -> float:
-    proposal = network.nodes(data="item")[proposal_idx]
+    proposal = network.nodes[proposal_idx]["item"]
     if not isinstance(proposal, Proposal):
         raise Exception(
             "proposal_idx must point to a node that has a Proposal")
 
-    incoming_edges = network.in_edges(proposal_idx, data="support")
-    convictions = [support.conviction for _, _, support in incoming_edges if support]
+    incoming_edges = network.pred[proposal_idx].values()
+    total_conviction = sum(data["support"].conviction for data in incoming_edges if data.get("type") == "support")
 
-    return np.sum(convictions)
+    return total_conviction
 
 
 def calc_total_affinity(network: nx.DiGraph) -> float:
-    view = network.edges(data="support")
-    affinities = [support.affinity for _, _, support in view]
-    return np.sum(affinities)
+    view = network.edges(data=True)
+    total_affinity = sum(data["support"].affinity for _, _, data in view if data.get("type") == "support")
+    return total_affinity
 
 
 def calc_avg_sentiment(network: nx.DiGraph) -> float:
     participants = get_participants(network)
-    sentiment_total = 0.0
-    for _, participant in participants:
-        sentiment_total += participant.sentiment
+    if len(participants) == 0:
+        raise Exception("The network has 0 Participants!")
 
+    sentiment_total = sum(participant.sentiment for _, participant in participants)
     sentiment_avg = sentiment_total / len(participants)
     return sentiment_avg
 
 
 def find_in_edges_of_type_for_proposal(network: nx.DiGraph, proposal_idx: int, edge_type: str) -> List[Tuple[int, int, str]]:
-    ans = []
-    for participant_idx, proposal_idx, t in network.in_edges(proposal_idx, data="type"):
-        if t == edge_type:
-            ans.append((participant_idx, proposal_idx, edge_type))
-
-    return ans
+    in_edges = network.pred[proposal_idx]
+    return [(participant_idx, proposal_idx, edge_type)
+            for participant_idx, data in in_edges.items() if data.get("type") == edge_type]
 
 
 def get_proposals_conviction_list(network):
     """
     Convenience function. Return a list of proposals' conviction of
-    a given network.
+    a given network, one entry per support edge.
     """
-    support_edges = get_edges_by_type(network, "support")
-    conviction_list = []
-    for i, j in support_edges:
-        edge = network.edges[i, j]
-        conviction = edge["conviction"]
-        conviction_list.append(conviction)
-    return conviction_list
+    return [data["support"].conviction for _, _, data in network.edges(data=True) if data.get("type") == "support"]
@@ -1,4 +1,5 @@
 import unittest
+from collections import Counter
 from unittest.mock import patch
 
 import networkx as nx
@@ -16,15 +17,19 @@ from network_utils import (add_proposal, add_participant, bootstrap_network, cal
 
 
 class TestNetworkUtils(unittest.TestCase):
-    def setUp(self):
-        self.network = nx.DiGraph()
-        self.params = {
+    @classmethod
+    def setUpClass(cls):
+        cls._params = {
             "probability_func": new_probability_func(seed=None),
             "exponential_func": new_exponential_func(seed=None),
             "gamma_func": new_gamma_func(seed=None),
             "random_number_func": new_random_number_func(seed=None)
         }
 
+    def setUp(self):
+        self.network = nx.DiGraph()
+        self.params = dict(self._params)
+
         for i in range(0, 10, 2):
             self.network.add_node(i, item=Participant(TokenBatch(0, 0), self.params["probability_func"],
                                 self.params["random_number_func"]))
@@ -63,6 +68,16 @@ class TestNetworkUtils(unittest.TestCase):
             self.assertIn(i, res)
             self.assertEqual(res[i]["type"], "support")
 
+        # Only edges of the requested type are returned
+        self.network.add_edge(0, 2, influence=0.5, type="influence")
+        res = get_edges_by_participant_and_type(self.network, 0, "influence")
+        self.assertEqual(list(res), [2])
+        self.assertEqual(res[2]["type"], "influence")
+
+        res = get_edges_by_participant_and_type(self.network, 0, "support")
+        self.assertNotIn(2, res)
+        self.assertEqual(sorted(res), [1, 3, 5, 7, 9])
+
     def test_setup_influence_edges_bulk(self):
         """
         Test that the code works, and that edges are created between DIFFERENT
@@ -112,7 +127,7 @@ class TestNetworkUtils(unittest.TestCase):
             mock.return_value = 0.5
             self.network = setup_influence_edges_single(
                                     self.network, 0, self.params["exponential_func"])
-            edges = list(get_edges_by_type(self.network, "influence"))
+            edges = get_edges_by_type(self.network, "influence")
             self.assertEqual(len(edges), 8)
             for e in edges:
                 self.assertIsInstance(e[0], int)
@@ -122,11 +137,11 @@ class TestNetworkUtils(unittest.TestCase):
             # Test that Participant 0 has 4 edges to other Participants, and
             # that other Participants (like Participant 2) only have 1 edge to
             # Participant 0.
-            a = tuple(zip(*edges))
-            self.assertEqual(a[0].count(0), 4)
-            self.assertEqual(a[0].count(2), 1)
-            self.assertEqual(a[1].count(0), 4)
-            self.assertEqual(a[1].count(2), 1)
+            sources, targets = np.array(edges).T
+            self.assertEqual(np.count_nonzero(sources == 0), 4)
+            self.assertEqual(np.count_nonzero(sources == 2), 1)
+            self.assertEqual(np.count_nonzero(targets == 0), 4)
+            self.assertEqual(np.count_nonzero(targets == 2), 1)
 
     def test_setup_influence_edges_single_wont_overwrite_existing_influences(self):
         """
@@ -137,7 +152,7 @@ class TestNetworkUtils(unittest.TestCase):
             mock.return_value = 0.5
             self.network = setup_influence_edges_single(
                                     self.network, 0, self.params["exponential_func"])
-            edges = list(get_edges_by_type(self.network, "influence"))
+            edges = get_edges_by_type(self.network, "influence")
             self.assertEqual(len(edges), 8)
 
             # First, check that the influence edges all have the original
@@ -150,7 +165,7 @@ class TestNetworkUtils(unittest.TestCase):
             # overwritten with 0.8
             mock.return_value = 0.8
             self.network = setup_influence_edges_single(self.network, 0, self.params["exponential_func"])
-            edges = list(get_edges_by_type(self.network, "influence"))
+            edges = get_edges_by_type(self.network, "influence")
             self.assertEqual(len(edges), 8)
             for e in edges:
                 self.assertEqual(self.network.get_edge_data(
@@ -228,10 +243,9 @@ class TestNetworkUtils(unittest.TestCase):
                                     self.params["random_number_func"], self.params["gamma_func"],
                                     self.params["exponential_func"])
 
-        edges = list(network.edges(data="type"))
-        _, _, edge_types = list(zip(*edges))
+        edge_types = Counter(t for _, _, t in network.edges(data="type"))
 
-        self.assertEqual(edge_types.count('support'), 4)
+        self.assertEqual(edge_types['support'], 4)
         self.assertEqual(len(get_participants(network)), 4)
         self.assertEqual(len(get_proposals(network)), 1)
 
@@ -285,13 +299,13 @@ class TestNetworkUtils(unittest.TestCase):
         ans = calc_total_conviction(self.network, 1)
         self.assertEqual(ans, 0)
 
-        support_edges = get_edges_by_type(self.network, "support")
-
         # Every support edge gets a conviction value. Since there are 5
         # Participants and 5 Proposals, this should result in a sum of 5
         # conviction for each Proposal.
-        for u, v in support_edges:
-            self.network.edges[u, v]["support"] = self.network.edges[u, v]["support"]._replace(conviction=1)
+        for _, _, edge in self.network.edges(data=True):
+            if edge.get("type") != "support":
+                continue
+            edge["support"] = edge["support"]._replace(conviction=1)
 
         for i in [1, 3, 5, 7, 9]:
             ans = calc_total_conviction(self.network, i)
@@ -306,25 +320,36 @@ class TestNetworkUtils(unittest.TestCase):
         ans = calc_total_affinity(self.network)
         self.assertNotEqual(ans, 0)
 
+        # Conflict edges carry no affinity and must not be counted (or crash
+        # the calculation).
+        support_affinities = [self.network.edges[e]["support"].affinity
+                              for e in get_edges_by_type(self.network, "support")]
+        self.network = setup_conflict_edges(self.network, self.params["random_number_func"], rate=1)
+        ans = calc_total_affinity(self.network)
+        self.assertAlmostEqual(ans, sum(support_affinities))
+
     def test_calc_avg_sentiment(self):
         """
         Ensure that the average sentiment was calculated correctly
         """
-        participants = get_participants(self.network)
+        participants = [p for _, p in get_participants(self.network)]
 
-        for _, p in participants:
+        for p in participants:
             p.sentiment = 0.5
         self.assertEqual(0.5, calc_avg_sentiment(self.network))
 
-        for _, p in participants:
+        for p in participants:
             p.sentiment = 1
         self.assertEqual(1, calc_avg_sentiment(self.network))
 
-        for _, p in participants:
-            p.sentiment = 1
+        # Every Participant is still at 1, only one of them changes.
         self.network.nodes[8]["item"].sentiment = 0.5
         self.assertEqual(0.9, calc_avg_sentiment(self.network))
 
+    def test_calc_avg_sentiment_network_with_no_participants(self):
+        with self.assertRaises(Exception):
+            calc_avg_sentiment(nx.DiGraph())
+
     def test_find_in_edges_of_type_for_proposal(self):
         """
         Ensure that only edges of the specified type are included in the answer
@@ -350,6 +375,6 @@ class TestNetworkUtils(unittest.TestCase):
         """
         self.network = setup_support_edges(self.network, self.params["random_number_func"])
         conviction_list = get_proposals_conviction_list(self.network)
-        expected_list = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
-                         0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        # 5 Participants x 5 Proposals support edges, none with conviction yet
+        expected_list = [0] * 25
         self.assertEqual(conviction_list, expected_list)
@@ -7,7 +7,7 @@ from convictionvoting import trigger_threshold
 from entities import Participant, Proposal, ProposalStatus
 from hatch import TokenBatch
 from network_utils import (add_proposal, add_participant, calc_median_affinity, calc_total_conviction,
-                           calc_total_funds_requested, find_in_edges_of_type_for_proposal, get_edges_by_type,
+                           calc_total_funds_requested, find_in_edges_of_type_for_proposal,
                            get_participants, get_proposals)
 
 
@@ -272,11 +272,11 @@ class ProposalFunding:
         network = s["network"]
         alpha = params["alpha_days_to_80p_of_max_voting_weight"]
 
-        support_edges = get_edges_by_type(network, "support")
-        for i, j in support_edges:
+        for i, j, edge in network.edges(data=True):
+            if edge.get("type") != "support":
+                continue
             proposal_status = network.nodes[j]['item'].status
             if proposal_status == ProposalStatus.CANDIDATE:
-                edge = network.edges[i, j]
                 prior_conviction = edge['support'].conviction
                 current_tokens = edge['support'].tokens
 
@@ -303,9 +303,9 @@ class TestProposalFunding(unittest.TestCase):
         conviction, the fund requested by the proposal will be deducted
         from de funding pool.
         """
-        _input = {"proposal_idxs_with_enough_conviction": [3]}
+        _input = {"proposal_idxs_with_enough_conviction": [4]}
         network_copy = copy.copy(self.network)
-        network_copy.nodes[3]["item"].funds_requested = 50
+        network_copy.nodes[4]["item"].funds_requested = 50
         old_funding_pool = self.commons._funding_pool
         ProposalFunding.su_deduct_funds_from_funding_pool(
             self.params, 0, 0, {"commons": self.commons,"network": network_copy, "funding_pool": 1000, "token_supply": 1000}, _input)
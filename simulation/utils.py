@@ -1,7 +1,7 @@
 import numpy as np
 from inspect import getmembers
 from types import FunctionType
-from scipy.stats import expon, gamma
+from scipy.stats import gamma
 
 
 
@@ -17,7 +17,10 @@ def new_probability_func(seed):
 def new_exponential_func(seed):
     random_state = np.random.RandomState(seed)
     def exponential(loc, scale):
-        return expon.rvs(loc=loc, scale=scale, random_state=random_state)
+        # Same draw as expon.rvs(loc=loc, scale=scale, random_state=random_state)
+        # without the scipy.stats dispatch, which dominates the cost of the
+        # per-pair calls from network_utils.influence().
+        return loc + scale * random_state.standard_exponential()
     return exponential
 
 
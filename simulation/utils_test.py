@@ -2,6 +2,7 @@ import unittest
 import networkx as nx
 import utils
 import numpy as np
+from scipy.stats import expon
 
 
 class TestUtils(unittest.TestCase):
@@ -18,6 +19,17 @@ class TestUtils(unittest.TestCase):
         result = exponential_func(loc=0, scale=100)
         self.assertGreater(result, 0)
 
+    def test_new_exponential_func_matches_scipy_expon(self):
+        """
+        The seeded stream must stay the same as the scipy.stats.expon one it
+        replaced, so that seeded simulations are reproducible.
+        """
+        exponential_func = utils.new_exponential_func(seed=42)
+        random_state = np.random.RandomState(42)
+        for _ in range(5):
+            self.assertAlmostEqual(exponential_func(loc=0.5, scale=3),
+                                   expon.rvs(loc=0.5, scale=3, random_state=random_state))
+
     def test_new_gamma_func(self):
         gamma_func = utils.new_gamma_func(seed=None)
         result = gamma_func(3, loc=0.001, scale=10000)